@@ -20,9 +20,12 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 import streamlit as st
 import tempfile
 import os
+import re
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 
 from config import (
     GROQ_API_KEY, GROQ_MODEL,
@@ -37,6 +40,19 @@ from query_engine import FinanceQueryEngine
 from user_profile import UserProfile
 
 
+# Seconds between reruns while a PDF is processed in the background
+PDF_POLL_INTERVAL = 1.0
+
+# Escape dollar signs so Streamlit markdown doesn't render them as LaTeX
+_DOLLAR_ESC = str.maketrans({"$": "\\$"})
+
+# Greetings / small talk that shouldn't get a transaction count footer
+_GREETING_RE = re.compile(
+    r"\b(?:hello|hi|hey|good\s+morning|good\s+evening|who\s+(?:created|made|built))\b",
+    re.IGNORECASE
+)
+
+
 # ===================
 # PAGE CONFIG
 # ===================
@@ -90,13 +106,12 @@ def init_components():
         return categorizer, vector_store, query_engine, user_profile, None
 
     except Exception as e:
-        import traceback
         traceback.print_exc()
         return None, None, None, None, str(e)
 
 
-def get_components():
-    """Get or initialize components"""
+def load_components():
+    """Get or initialize components, stopping the app on init errors"""
     categorizer, vector_store, query_engine, user_profile, error = init_components()
 
     if error:
@@ -107,6 +122,60 @@ def get_components():
     return categorizer, vector_store, query_engine, user_profile
 
 
+def get_components():
+    """Get the components resolved once for this rerun by main()"""
+    return st.session_state["_components"]
+
+
+class _StatsUnavailable(Exception):
+    """Raised inside _cached_stats so error results aren't cached"""
+
+    def __init__(self, stats: dict):
+        super().__init__(stats.get("error"))
+        self.stats = stats
+
+
+@st.cache_resource
+def _vs_version() -> dict:
+    """Vector store mutation counter shared by all sessions"""
+    return {"value": 0, "lock": threading.Lock()}
+
+
+@st.cache_data(ttl=10, show_spinner=False)
+def _cached_stats(collection: str, version: int, _vector_store) -> dict:
+    """
+    Collection stats, memoized per collection and mutation version
+
+    The version is process-wide (like this cache) and is bumped after
+    every add/delete, so a rerun without writes skips the Qdrant round trip.
+    """
+    stats = _vector_store.get_collection_stats()
+    if "error" in stats:
+        raise _StatsUnavailable(stats)
+    return stats
+
+
+def get_stats(vector_store) -> dict:
+    """Get (cached) collection stats for the current vector store version"""
+    try:
+        return _cached_stats(QDRANT_COLLECTION, _vs_version()["value"], vector_store)
+    except _StatsUnavailable as e:
+        return e.stats
+
+
+def bump_vs_version():
+    """Invalidate cached stats after the vector store was modified"""
+    version = _vs_version()
+    with version["lock"]:
+        version["value"] += 1
+
+
+@st.cache_resource
+def get_pdf_executor() -> ThreadPoolExecutor:
+    """Shared worker pool for PDF extraction"""
+    return ThreadPoolExecutor(max_workers=2)
+
+
 # ===================
 # SIDEBAR
 # ===================
@@ -150,32 +219,54 @@ def render_sidebar():
     st.sidebar.subheader("Uploaded Files")
 
     files = user_profile.get_files()
-    if files:
-        for file_info in files:
-            col1, col2 = st.sidebar.columns([3, 1])
-            with col1:
-                st.text(f"{file_info['filename'][:20]}...")
-                st.caption(f"{file_info['transaction_count']} transactions")
-            with col2:
-                if st.button("X", key=f"del_{file_info['file_id']}", help="Delete file"):
-                    # Delete from vector store
-                    vector_store.delete_by_file_id(file_info['file_id'])
-                    # Delete from profile
-                    user_profile.remove_file(file_info['file_id'])
-                    st.rerun()
-    else:
-        st.sidebar.info("No files uploaded yet")
+    with st.sidebar:
+        _render_file_list(user_profile)
 
     # Stats
     st.sidebar.divider()
     st.sidebar.subheader("Statistics")
-    stats = vector_store.get_collection_stats()
+    stats = get_stats(vector_store)
     st.sidebar.metric("Total Transactions", stats.get("total_points", 0))
     st.sidebar.metric("Files Uploaded", len(files))
 
     return mode
 
 
+@st.fragment
+def _render_file_list(user_profile):
+    """
+    Render uploaded files with delete buttons
+
+    Runs as a fragment, so its widgets only rerun this block; a delete
+    escalates to a full rerun so stats and chat pick up the change.
+    """
+    files = user_profile.get_files()
+    if not files:
+        st.info("No files uploaded yet")
+        return
+
+    for file_info in files:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.text(f"{file_info['filename'][:20]}...")
+            st.caption(f"{file_info['transaction_count']} transactions")
+        with col2:
+            if st.button("X", key=f"del_{file_info['file_id']}", help="Delete file"):
+                _delete_file(file_info['file_id'], user_profile)
+                st.rerun()
+
+
+def _delete_file(file_id: str, user_profile):
+    """Delete a file's transactions and forget it in the profile"""
+    _, vector_store, _, _ = get_components()
+
+    # Delete from vector store (waits, so the next stats read is current)
+    vector_store.delete_by_file_id(file_id)
+    bump_vs_version()
+    # Delete from profile
+    user_profile.remove_file(file_id)
+
+
 # ===================
 # DEMO MODE
 # ===================
@@ -191,19 +282,21 @@ def render_demo_mode():
     with col1:
         if st.button("Load Demo Data", type="primary", use_container_width=True):
             with st.spinner("Loading demo transactions..."):
-                # Clear existing demo data
-                vector_store.delete_by_file_id("demo")
-                user_profile.remove_file("demo")
+                with user_profile.batch():
+                    # Clear existing demo data
+                    vector_store.delete_by_file_id("demo")
+                    user_profile.remove_file("demo")
 
-                # Load and categorize demo data
-                transactions = load_demo_data(str(DEMO_CSV_PATH), file_id="demo")
-                categorized = categorizer.categorize_transactions(transactions)
+                    # Load and categorize demo data
+                    transactions = load_demo_data(str(DEMO_CSV_PATH), file_id="demo")
+                    categorized = categorizer.categorize_transactions(transactions, copy=False)
 
-                # Add to vector store
-                added = vector_store.add_transactions(categorized)
+                    # Add to vector store
+                    added = vector_store.add_transactions_bulk(categorized)
+                    bump_vs_version()
 
-                # Track in profile
-                user_profile.add_file("demo", "sample_transactions.csv", added)
+                    # Track in profile
+                    user_profile.add_file("demo", "sample_transactions.csv", added)
 
                 st.success(f"Loaded {added} demo transactions!")
                 st.rerun()
@@ -211,6 +304,7 @@ def render_demo_mode():
     with col2:
         if st.button("Clear Demo Data", use_container_width=True):
             vector_store.delete_by_file_id("demo")
+            bump_vs_version()
             user_profile.remove_file("demo")
             st.success("Demo data cleared!")
             st.rerun()
@@ -219,64 +313,31 @@ def render_demo_mode():
     st.subheader("Spending Analysis")
 
     try:
-        df = pd.read_csv(DEMO_CSV_PATH)
-
-        # Calculate spending by category
-        # Filter only expenses (negative amounts)
-        expenses = df[df['amount'] < 0].copy()
-        expenses['amount'] = expenses['amount'].abs()
-
-        # Group by category (use description keywords to categorize)
-        categorizer = TransactionCategorizer(str(CATEGORIES_PATH))
-        categorized_list = categorizer.categorize_transactions(expenses.to_dict('records'))
-        cat_df = pd.DataFrame(categorized_list)
+        (
+            df, spending_by_cat, total_spent,
+            total_income, num_transactions, top_category
+        ) = _load_demo_analysis(
+            str(DEMO_CSV_PATH),
+            os.path.getmtime(DEMO_CSV_PATH),
+            categorizer
+        )
 
-        # Aggregate by category
-        spending_by_cat = cat_df.groupby('category')['amount'].sum().reset_index()
-        spending_by_cat = spending_by_cat.sort_values('amount', ascending=False)
+        fig_pie, fig_bar = _build_demo_figs(
+            tuple(spending_by_cat.itertuples(index=False, name=None))
+        )
 
         # Create two columns for charts
         chart_col1, chart_col2 = st.columns(2)
 
         with chart_col1:
-            # Pie chart
-            fig_pie = px.pie(
-                spending_by_cat,
-                values='amount',
-                names='category',
-                title='Spending by Category',
-                hole=0.4,
-                color_discrete_sequence=px.colors.qualitative.Set3
-            )
-            fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-            fig_pie.update_layout(showlegend=False, height=400)
             st.plotly_chart(fig_pie, use_container_width=True)
 
         with chart_col2:
-            # Bar chart
-            fig_bar = px.bar(
-                spending_by_cat,
-                x='category',
-                y='amount',
-                title='Spending Amount by Category',
-                color='amount',
-                color_continuous_scale='Reds'
-            )
-            fig_bar.update_layout(
-                xaxis_tickangle=-45,
-                height=400,
-                showlegend=False
-            )
-            fig_bar.update_traces(texttemplate='$%{y:.0f}', textposition='outside')
             st.plotly_chart(fig_bar, use_container_width=True)
 
         # Summary metrics
         st.subheader("Summary")
         metric_cols = st.columns(4)
-        total_spent = expenses['amount'].sum()
-        total_income = df[df['amount'] > 0]['amount'].sum()
-        num_transactions = len(df)
-        top_category = spending_by_cat.iloc[0]['category'] if len(spending_by_cat) > 0 else "N/A"
 
         metric_cols[0].metric("Total Spent", f"${total_spent:,.2f}")
         metric_cols[1].metric("Total Income", f"${total_income:,.2f}")
@@ -291,6 +352,110 @@ def render_demo_mode():
         st.warning(f"Could not load data: {e}")
 
 
+@st.cache_data(show_spinner=False)
+def _load_demo_analysis(csv_path: str, mtime: float, _categorizer):
+    """
+    Load and categorize the demo CSV (cached until the file changes)
+
+    Args:
+        csv_path: Path to the demo CSV file
+        mtime: File modification time, used only to invalidate the cache
+        _categorizer: Shared TransactionCategorizer (not hashed)
+
+    Returns:
+        (df, spending_by_cat, total_spent, total_income,
+         num_transactions, top_category)
+    """
+    # Arrow-backed columns keep the abs/str/groupby work below in Arrow compute
+    df = pd.read_csv(
+        csv_path,
+        engine='pyarrow',
+        dtype_backend='pyarrow',
+        dtype={
+            'date': 'string[pyarrow]',
+            'description': 'string[pyarrow]',
+            'amount': 'double[pyarrow]',
+            'type': 'string[pyarrow]',
+        }
+    )
+
+    # Calculate spending by category
+    # Filter only expenses (negative amounts)
+    expenses = df[df['amount'] < 0].copy()
+    expenses['amount'] = expenses['amount'].abs()
+
+    # Categorize using description keywords
+    categories = _categorizer.categorize_series(expenses['description'])
+
+    # Aggregate by category: factorize to integer codes, sum with bincount
+    codes, uniques = pd.factorize(categories, sort=False)
+    totals = np.bincount(
+        codes,
+        weights=expenses['amount'].to_numpy(dtype=float),
+        minlength=len(uniques)
+    )
+    spending_by_cat = pd.DataFrame(
+        {'category': uniques, 'amount': totals}
+    ).sort_values('amount', ascending=False)
+
+    total_spent = expenses['amount'].sum()
+    total_income = df[df['amount'] > 0]['amount'].sum()
+    num_transactions = len(df)
+    top_category = spending_by_cat.iloc[0]['category'] if len(spending_by_cat) > 0 else "N/A"
+
+    return df, spending_by_cat, total_spent, total_income, num_transactions, top_category
+
+
+@st.cache_data(show_spinner=False)
+def _build_demo_figs(spending_by_cat_frozen: tuple):
+    """
+    Build the demo pie and bar charts (cached by the aggregated data)
+
+    Args:
+        spending_by_cat_frozen: Tuple of (category, amount) pairs
+
+    Returns:
+        (fig_pie, fig_bar)
+    """
+    # Plotly is heavy and only needed for these charts, so import it lazily
+    import plotly.express as px
+
+    spending_by_cat = pd.DataFrame(
+        list(spending_by_cat_frozen),
+        columns=['category', 'amount']
+    )
+
+    # Pie chart
+    fig_pie = px.pie(
+        spending_by_cat,
+        values='amount',
+        names='category',
+        title='Spending by Category',
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Set3
+    )
+    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
+    fig_pie.update_layout(showlegend=False, height=400)
+
+    # Bar chart
+    fig_bar = px.bar(
+        spending_by_cat,
+        x='category',
+        y='amount',
+        title='Spending Amount by Category',
+        color='amount',
+        color_continuous_scale='Reds'
+    )
+    fig_bar.update_layout(
+        xaxis_tickangle=-45,
+        height=400,
+        showlegend=False
+    )
+    fig_bar.update_traces(texttemplate='$%{y:.0f}', textposition='outside')
+
+    return fig_pie, fig_bar
+
+
 # ===================
 # REAL MODE
 # ===================
@@ -308,50 +473,24 @@ def render_real_mode():
         help="Upload a PDF bank statement to analyze"
     )
 
+    pdf_job = st.session_state.get("pdf_job")
+
     if uploaded_file:
-        if st.button("Process PDF", type="primary"):
-            with st.spinner("Extracting transactions from PDF..."):
-                # Save to temp file
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                    tmp.write(uploaded_file.getvalue())
-                    tmp_path = tmp.name
-
-                try:
-                    # Process PDF
-                    processor = PDFProcessor()
-                    result = processor.process_pdf(tmp_path)
-
-                    if result["success"]:
-                        # Categorize transactions
-                        categorized = categorizer.categorize_transactions(
-                            result["transactions"]
-                        )
-
-                        # Add to vector store
-                        added = vector_store.add_transactions(categorized)
-
-                        # Track in profile
-                        user_profile.add_file(
-                            result["file_id"],
-                            uploaded_file.name,
-                            added
-                        )
-
-                        st.success(f"Extracted {added} transactions from {uploaded_file.name}")
-
-                        # Show preview
-                        st.subheader("Extracted Transactions")
-                        import pandas as pd
-                        df = pd.DataFrame(result["transactions"][:10])
-                        st.dataframe(df, use_container_width=True)
-
-                    else:
-                        st.error(f"Failed to extract transactions: {result.get('error', 'Unknown error')}")
-                        st.info("Tip: Make sure the PDF contains readable transaction tables.")
-
-                finally:
-                    # Cleanup temp file
-                    os.unlink(tmp_path)
+        if st.button("Process PDF", type="primary", disabled=pdf_job is not None):
+            # Save to temp file
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+                tmp.write(uploaded_file.getvalue())
+                tmp_path = tmp.name
+
+            # Extract on a worker thread so the UI stays responsive
+            processor = PDFProcessor()
+            pdf_job = {
+                "future": get_pdf_executor().submit(processor.process_pdf, tmp_path),
+                "tmp_path": tmp_path,
+                "filename": uploaded_file.name,
+            }
+            st.session_state.pdf_job = pdf_job
+            _render_pdf_job_status()
 
     # Instructions
     with st.expander("PDF Processing Tips"):
@@ -372,6 +511,81 @@ def render_real_mode():
         """)
 
 
+def render_pdf_job():
+    """
+    Show or collect the background PDF extraction
+
+    Runs in both modes, so a job started in Real Mode is still collected
+    (and its temp file removed) after switching to Demo Mode.
+    """
+    pdf_job = st.session_state.get("pdf_job")
+    if pdf_job is None:
+        return
+
+    if not pdf_job["future"].done():
+        _render_pdf_job_status()
+        return
+
+    categorizer, vector_store, query_engine, user_profile = get_components()
+    del st.session_state.pdf_job
+
+    try:
+        result = pdf_job["future"].result()
+        _ingest_pdf_result(result, pdf_job["filename"], categorizer, vector_store, user_profile)
+    except Exception as e:
+        st.error(f"Failed to extract transactions: {e}")
+    finally:
+        # Cleanup temp file
+        os.unlink(pdf_job["tmp_path"])
+
+
+@st.fragment(run_every=PDF_POLL_INTERVAL)
+def _render_pdf_job_status():
+    """Poll the PDF worker, redrawing only this status block"""
+    pdf_job = st.session_state.get("pdf_job")
+    if pdf_job is None:
+        return
+
+    if pdf_job["future"].done():
+        # Full rerun so render_pdf_job collects the result
+        st.rerun()
+
+    st.info(f"Extracting transactions from {pdf_job['filename']}...")
+
+
+def _ingest_pdf_result(result: dict, filename: str, categorizer, vector_store, user_profile):
+    """Categorize and index the transactions extracted from a PDF"""
+    if result["success"]:
+        with st.spinner("Indexing transactions..."):
+            # Categorize transactions
+            categorized = categorizer.categorize_transactions(
+                result["transactions"],
+                copy=False
+            )
+
+            # Add to vector store
+            added = vector_store.add_transactions_bulk(categorized)
+            bump_vs_version()
+
+            # Track in profile
+            user_profile.add_file(
+                result["file_id"],
+                filename,
+                added
+            )
+
+        st.success(f"Extracted {added} transactions from {filename}")
+
+        # Show preview
+        st.subheader("Extracted Transactions")
+        df = pd.DataFrame(result["transactions"][:10])
+        st.dataframe(df, use_container_width=True)
+
+    else:
+        st.error(f"Failed to extract transactions: {result.get('error', 'Unknown error')}")
+        st.info("Tip: Make sure the PDF contains readable transaction tables.")
+
+
 # ===================
 # CHAT INTERFACE
 # ===================
@@ -380,7 +594,7 @@ def render_chat():
     categorizer, vector_store, query_engine, user_profile = get_components()
 
     # Check if data is loaded
-    stats = vector_store.get_collection_stats()
+    stats = get_stats(vector_store)
     total_points = stats.get("total_points", 0)
 
     if total_points == 0:
@@ -398,36 +612,6 @@ def render_chat():
         del st.session_state.pending_question
         st.session_state.messages.append({"role": "user", "content": pending})
 
-    # Process unanswered message first (before displaying)
-    if st.session_state.messages and st.session_state.messages[-1]["role"] == "user":
-        last_question = st.session_state.messages[-1]["content"]
-
-        try:
-            # Ensure index is loaded
-            if vector_store.index is None:
-                vector_store.index = vector_store._load_existing_index()
-
-            # Get response
-            result = query_engine.query(last_question)
-            response = result["answer"]
-
-            # Fix: Escape dollar signs to prevent LaTeX rendering issues
-            response = response.replace("$", "\\$")
-
-            # Only show transaction count for actual financial questions (not greetings)
-            greeting_words = ["hello", "hi", "hey", "good morning", "good evening", "who created", "who made", "who built"]
-            is_greeting = any(word in last_question.lower() for word in greeting_words)
-
-            if not is_greeting and result.get("transactions_used", 0) > 0:
-                total_in_db = vector_store.get_collection_stats().get("total_points", 0)
-                response += f"\n\n---\n*Analyzed {result['transactions_used']} of {total_in_db} transactions*"
-
-            st.session_state.messages.append({"role": "assistant", "content": response})
-
-        except Exception as e:
-            error_msg = f"I had trouble processing that. Please try again."
-            st.session_state.messages.append({"role": "assistant", "content": error_msg})
-
     # Top bar with status and clear button
     col1, col2 = st.columns([4, 1])
     with col1:
@@ -462,12 +646,62 @@ def render_chat():
                 with st.chat_message(message["role"]):
                     st.markdown(message["content"])
 
+            # Answer a question left unanswered (e.g. from quick buttons)
+            if st.session_state.messages[-1]["role"] == "user":
+                _answer_and_append(st.session_state.messages[-1]["content"], vector_store, query_engine)
+
     # Chat input at the bottom (this naturally stays at bottom)
     if prompt := st.chat_input("Ask about your finances..."):
+        # Answer in this run so the rerun below only has to redraw the chat
         st.session_state.messages.append({"role": "user", "content": prompt})
+        with chat_container:
+            with st.chat_message("user"):
+                st.markdown(prompt)
+            _answer_and_append(prompt, vector_store, query_engine)
         st.rerun()
 
 
+def _escape_stream(chunks):
+    """Escape dollar signs chunk by chunk to prevent LaTeX rendering issues"""
+    for chunk in chunks:
+        yield chunk.translate(_DOLLAR_ESC)
+
+
+def _answer_and_append(last_question: str, vector_store, query_engine):
+    """
+    Stream the answer to the latest question and append it to history
+
+    Must be called inside the chat container so the reply renders in place.
+    """
+    try:
+        # Ensure index is loaded
+        if vector_store.index is None:
+            vector_store.index = vector_store._load_existing_index()
+
+        with st.chat_message("assistant"):
+            # Stream response tokens as they arrive
+            result = query_engine.stream_query(last_question)
+            response = st.write_stream(_escape_stream(result["answer_stream"]))
+
+            # Only show transaction count for actual financial questions (not greetings)
+            is_greeting = bool(_GREETING_RE.search(last_question))
+
+            if not is_greeting and result.get("transactions_used", 0) > 0:
+                total_in_db = get_stats(vector_store).get("total_points", 0)
+                footer = f"\n\n---\n*Analyzed {result['transactions_used']} of {total_in_db} transactions*"
+                footer = footer.translate(_DOLLAR_ESC)
+                st.markdown(footer)
+                response += footer
+
+        st.session_state.messages.append({"role": "assistant", "content": response})
+
+    except Exception as e:
+        print(f"[CHAT ERROR] {str(e)}")
+        traceback.print_exc()
+        error_msg = f"I had trouble processing that. Please try again."
+        st.session_state.messages.append({"role": "assistant", "content": error_msg})
+
+
 # ===================
 # MAIN APP
 # ===================
@@ -476,6 +710,9 @@ def main():
     st.title("Finance Advisor AI")
     st.caption("Your personal AI-powered financial assistant")
 
+    # Resolve components once per rerun; render functions read them back
+    st.session_state["_components"] = load_components()
+
     # Render sidebar and get mode
     mode = render_sidebar()
 
@@ -486,6 +723,8 @@ def main():
         render_chat()
 
     with tab_data:
+        render_pdf_job()
+
         if mode == "Demo Mode":
             render_demo_mode()
         else:
@@ -9,6 +9,7 @@ Usage:
 """
 
 import sys
+from collections import Counter
 from pathlib import Path
 
 # Add src to path
@@ -66,13 +67,10 @@ def main():
     categorized = categorizer.categorize_transactions(transactions)
 
     # Count categories
-    categories = {}
-    for tx in categorized:
-        cat = tx.get("category", "other")
-        categories[cat] = categories.get(cat, 0) + 1
+    categories = Counter(tx.get("category", "other") for tx in categorized)
 
     print(f"  Categories found:")
-    for cat, count in sorted(categories.items(), key=lambda x: -x[1]):
+    for cat, count in categories.most_common():
         print(f"    - {cat}: {count} transactions")
 
     # Connect to Qdrant Cloud
@@ -101,8 +99,12 @@ def main():
     vector_store.clear_all()
     print(f"  Cleared and recreated collection with indexes")
 
-    # Add new demo data
-    added = vector_store.add_transactions(categorized)
+    # Add new demo data (defer HNSW indexing until the upload is done)
+    indexing_threshold = vector_store.set_indexing_enabled(False)
+    try:
+        added = vector_store.add_transactions_bulk(categorized)
+    finally:
+        vector_store.set_indexing_enabled(True, indexing_threshold)
     print(f"  Added {added} transactions to Qdrant Cloud")
 
     # Verify
@@ -112,8 +114,9 @@ def main():
     # Update user profile
     print("\n[Bonus] Setting up user profile...")
     profile = UserProfile(str(USER_PROFILE_PATH))
-    profile.add_file("demo", "sample_transactions.csv", added)
-    profile.set_monthly_income(5000)  # Default income for demo
+    with profile.batch():
+        profile.add_file("demo", "sample_transactions.csv", added)
+        profile.set_monthly_income(5000)  # Default income for demo
     print(f"  Demo file tracked in profile")
     print(f"  Default monthly income set to $5,000")
 
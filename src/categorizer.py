@@ -19,9 +19,12 @@ When we see "STARBUCKS #1234", we match it to "dining" category.
 """
 
 import json
-from typing import Dict, List, Optional
+import re
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
+import pandas as pd
+
 
 class TransactionCategorizer:
     """Categorize transactions based on description keywords"""
@@ -34,7 +37,12 @@ class TransactionCategorizer:
             categories_path: Path to categories.json file
         """
         self.categories = self._load_categories(categories_path)
-        self.keyword_map = self._build_keyword_map()
+        self._icon_by_category = {
+            category: info.get("icon", "📦")
+            for category, info in self.categories.items()
+        }
+        self._group_to_category: Dict[str, str] = {}
+        self._category_pattern = self._build_category_pattern()
 
     def _load_categories(self, path: str) -> Dict:
         """Load categories from JSON file"""
@@ -42,19 +50,53 @@ class TransactionCategorizer:
             data = json.load(f)
         return data.get("categories", {})
 
-    def _build_keyword_map(self) -> Dict[str, str]:
+    def _build_category_pattern(self) -> Optional["re.Pattern"]:
         """
-        Build a reverse map: keyword -> category
-
-        This makes lookup faster when categorizing
+        Compile one regex that picks the same category as a keyword loop
+
+        Keywords are checked in definition order (a keyword listed under
+        several categories keeps its first position but belongs to the last
+        one), and the first keyword found anywhere in the text wins. Each
+        run of consecutive keywords with the same category becomes one
+        lookahead anchored at the start, with a named group, so a single
+        search tells us the category via match.lastgroup.
         """
-        keyword_map = {}
-
+        # Resolve each keyword to one category (last definition wins)
+        keyword_map: Dict[str, str] = {}
         for category, info in self.categories.items():
             for keyword in info.get("keywords", []):
                 keyword_map[keyword.lower()] = category
 
-        return keyword_map
+        # Runs of consecutive keywords that share a category
+        runs: List[Tuple[str, List[str]]] = []
+        for keyword, category in keyword_map.items():
+            if runs and runs[-1][0] == category:
+                runs[-1][1].append(keyword)
+            else:
+                runs.append((category, [keyword]))
+
+        if not runs:
+            return None
+
+        groups = []
+        for i, (category, keywords) in enumerate(runs):
+            # Category names may not be valid group names, so use c0, c1, ...
+            group_name = f"c{i}"
+            self._group_to_category[group_name] = category
+            alternation = "|".join(re.escape(k) for k in keywords)
+            groups.append(f"(?=.*?(?P<{group_name}>{alternation}))")
+
+        return re.compile("^(?:" + "|".join(groups) + ")", re.IGNORECASE | re.DOTALL)
+
+    def _match_category(self, description: str) -> Optional[str]:
+        """Return the category of the first keyword (in definition order) found, or None"""
+        if self._category_pattern is None:
+            return None
+
+        match = self._category_pattern.search(description)
+        if match:
+            return self._group_to_category[match.lastgroup]
+        return None
 
     def categorize(self, description: str) -> Dict:
         """
@@ -71,16 +113,14 @@ class TransactionCategorizer:
                 "confidence": "keyword_match"
             }
         """
-        description_lower = description.lower()
-
-        # Check each keyword
-        for keyword, category in self.keyword_map.items():
-            if keyword in description_lower:
-                return {
-                    "category": category,
-                    "icon": self.categories[category].get("icon", "📦"),
-                    "confidence": "keyword_match"
-                }
+        category = self._match_category(description)
+
+        if category is not None:
+            return {
+                "category": category,
+                "icon": self._icon_by_category.get(category, "📦"),
+                "confidence": "keyword_match"
+            }
 
         # Default to "other" if no match
         return {
@@ -89,32 +129,66 @@ class TransactionCategorizer:
             "confidence": "default"
         }
 
+    def categorize_many(self, descriptions: List[str]) -> List[Dict]:
+        """
+        Categorize many descriptions in one pass
+
+        Args:
+            descriptions: List of transaction descriptions
+
+        Returns:
+            List of category info dictionaries (same shape as categorize)
+        """
+        return [self.categorize(desc) for desc in descriptions]
+
+    def categorize_series(self, descriptions: pd.Series) -> pd.Series:
+        """
+        Categorize a pandas Series of descriptions without leaving pandas
+
+        Args:
+            descriptions: Series of transaction descriptions
+
+        Returns:
+            Series of category names ("other" when nothing matches)
+        """
+        if self._category_pattern is None:
+            return pd.Series("other", index=descriptions.index)
+
+        # One column per keyword group; at most one is set per row
+        # fillna keeps the (Arrow) string dtype; missing descriptions -> "other"
+        matches = descriptions.fillna("").str.extract(self._category_pattern)
+        matched = matches.notna()
+
+        categories = matched.idxmax(axis=1).map(self._group_to_category)
+        return categories.where(matched.any(axis=1), "other")
+
     def categorize_transactions(
         self,
-        transactions: List[Dict]
+        transactions: List[Dict],
+        copy: bool = False
     ) -> List[Dict]:
         """
         Add category info to a list of transactions
 
         Args:
             transactions: List of transaction dictionaries
+            copy: If True, leave the input dicts untouched and return copies;
+                  otherwise update them in place (the caller owns the list)
 
         Returns:
-            Same list with category, icon, and confidence added
+            List with category, icon, and confidence added
+            (the same list object when copy is False)
         """
-        categorized = []
+        descriptions = [tx.get("description", "") for tx in transactions]
+        cat_infos = self.categorize_many(descriptions)
 
-        for tx in transactions:
-            # Get category info
-            cat_info = self.categorize(tx.get("description", ""))
+        categorized = [tx.copy() for tx in transactions] if copy else transactions
 
+        for tx, cat_info in zip(categorized, cat_infos):
             # Add to transaction
-            tx_copy = tx.copy()
-            tx_copy["category"] = cat_info["category"]
-            tx_copy["icon"] = cat_info["icon"]
-            tx_copy["category_confidence"] = cat_info["confidence"]
-
-            categorized.append(tx_copy)
+            tx["category"] = cat_info["category"]
+            tx["icon"] = cat_info["icon"]
+            tx["category_confidence"] = cat_info["confidence"]
 
         return categorized
 
@@ -0,0 +1,155 @@
+"""
+EMBEDDING_CACHE.PY - Persistent on-disk cache for text embeddings
+
+This module handles:
+1. Hashing normalized transaction text (+ model name) into cache keys
+2. Looking up previously computed embeddings in SQLite
+3. Storing new embeddings as float32 bytes
+
+HOW IT WORKS:
+=============
+
+Statements repeat the same merchants over and over:
+    "STARBUCKS #1234" appears in every monthly statement
+
+First upload:  text -> model -> vector -> saved under sha256(text)
+Next upload:   text -> sha256(text) -> vector read from disk (no model call)
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, Optional, Sequence
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "finance_advisor" / "embeddings.sqlite"
+
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+_WS_RE = re.compile(r"\s+")
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed embedding cache keyed by content hash
+
+    Features:
+    - Survives restarts (one file on disk)
+    - Separate entries per embedding model
+    - Safe to share between Streamlit sessions (threads)
+    """
+
+    def __init__(self, model_name: str, db_path: Optional[str] = None):
+        """
+        Open (or create) the cache database
+
+        Args:
+            model_name: Embedding model the cached vectors belong to
+            db_path: Path to the SQLite file (defaults to ~/.cache/finance_advisor)
+        """
+        self.model_name = model_name
+        self.db_path = Path(db_path) if db_path else DEFAULT_CACHE_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS emb ("
+            "hash BLOB NOT NULL, model TEXT NOT NULL, vec BLOB NOT NULL, "
+            "PRIMARY KEY (hash, model))"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        """
+        Hash text into a cache key
+
+        Text is lowercased and whitespace-collapsed first, which doesn't
+        change what the (uncased) MiniLM tokenizer sees.
+        """
+        normalized = _WS_RE.sub(" ", text).strip().lower()
+        return hashlib.sha256(normalized.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        """Get a single cached embedding, or None"""
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, np.ndarray]:
+        """
+        Look up several embeddings at once
+
+        Args:
+            keys: Cache keys from key()
+
+        Returns:
+            Dict of key -> embedding for the keys that were cached
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_CHUNK):
+                chunk = keys[start:start + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT hash, vec FROM emb WHERE model = ? AND hash IN ({placeholders})",
+                    [self.model_name, *chunk]
+                )
+                for key, vec in rows:
+                    found[key] = np.frombuffer(vec, dtype=np.float32)
+
+        return found
+
+    def put_many(self, items: Dict[bytes, Sequence[float]]):
+        """
+        Store several embeddings
+
+        Args:
+            items: Dict of key -> embedding
+        """
+        if not items:
+            return
+
+        rows = [
+            (key, self.model_name, np.asarray(vec, dtype=np.float32).tobytes())
+            for key, vec in items.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO emb (hash, model, vec) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM emb WHERE model = ?", (self.model_name,)
+            ).fetchone()[0]
+
+
+# ===================
+# TEST
+# ===================
+if __name__ == "__main__":
+    import tempfile
+
+    print("Testing Embedding Cache...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = EmbeddingCache("test-model", str(Path(tmp) / "emb.sqlite"))
+
+        k1 = EmbeddingCache.key("STARBUCKS  #1234")
+        k2 = EmbeddingCache.key("starbucks #1234")
+        print(f"Normalized keys match: {k1 == k2}")
+
+        cache.put_many({k1: [0.1, 0.2, 0.3]})
+        print(f"Cached: {cache.get(k1)}")
+        print(f"Missing: {cache.get(EmbeddingCache.key('uber'))}")
+        print(f"Entries: {len(cache)}")
@@ -3,7 +3,7 @@ PDF_PROCESSOR.PY - Extract transactions from bank statement PDFs
 
 This module handles:
 1. Reading PDF files (using PyMuPDF)
-2. Extracting text from each page
+2. Extracting tables and text from each page
 3. Parsing text into structured transactions
 4. Handling different bank statement formats
 
@@ -24,15 +24,87 @@ We extract this text and parse it into:
     }
 """
 
+import os
 import re
+import multiprocessing
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import lru_cache
+from itertools import chain
+from typing import List, Dict, Optional, Iterable, Iterator, Union, TYPE_CHECKING
 from pathlib import Path
 
-import fitz  # PyMuPDF
+import numpy as np
 import pandas as pd
-import pdfplumber
+
+# PyMuPDF and pdfplumber are heavy and only needed for real PDFs, so they
+# are imported where used; demo-only runs never load them
+if TYPE_CHECKING:
+    import fitz  # PyMuPDF
+
+
+# Characters dropped from amount strings before float() ("$1,234.50")
+_AMOUNT_STRIP = str.maketrans("", "", "$,")
+
+# Collapses runs of whitespace in descriptions
+_WS_RE = re.compile(r'\s+')
+
+# strptime formats, in the same order as PDFProcessor.date_patterns
+_DATE_FORMATS = (
+    '%m/%d/%Y',
+    '%m/%d/%y',
+    '%Y-%m-%d',
+    '%m-%d-%Y',
+)
+
+
+@lru_cache(maxsize=4096)
+def _normalize_date(date_str: str, first_format: Optional[str] = None) -> str:
+    """
+    Convert various date formats to YYYY-MM-DD
+
+    Statements repeat the same few dates many times, so results are cached.
+    first_format (when known from the regex match) is tried before the rest.
+    """
+    formats_to_try = _DATE_FORMATS
+    if first_format is not None:
+        formats_to_try = (first_format,) + tuple(
+            fmt for fmt in _DATE_FORMATS if fmt != first_format
+        )
+
+    for fmt in formats_to_try:
+        try:
+            dt = datetime.strptime(date_str, fmt)
+            return dt.strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+
+    return date_str  # Return as-is if can't parse
+
+
+# PDFs with fewer pages than this are extracted in-process
+# (spawning workers costs more than it saves on short statements)
+PARALLEL_PAGE_THRESHOLD = 8
+
+
+def _page_text_blocks(page) -> List[str]:
+    """Text of each text block on a page (image blocks are skipped)"""
+    # Block tuples are (x0, y0, x1, y1, text, block_no, block_type)
+    return [block[4] for block in page.get_text("blocks") if block[6] == 0]
+
+
+def _extract_pages(pdf_path: str, page_nums: List[int]) -> List[str]:
+    """
+    Extract text blocks from a range of pages (process pool worker)
+
+    Each worker opens its own document because fitz objects can't be
+    pickled across processes.
+    """
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as doc:
+        return [text for i in page_nums for text in _page_text_blocks(doc[i])]
 
 
 class PDFProcessor:
@@ -47,26 +119,84 @@ class PDFProcessor:
             r'\d{2}-\d{2}-\d{4}',  # MM-DD-YYYY
         ]
 
-        self.amount_pattern = r'[-+]?\$?[\d,]+\.?\d*'
-
-    def extract_text_pymupdf(self, pdf_path: str) -> str:
+        # Starts with a digit and allows at most two decimals; the lookahead
+        # keeps a match from ending mid-number (e.g. "23." in "-23.4")
+        self.amount_pattern = r'[-+]?\$?\d[\d,]*(?:\.\d{1,2})?(?!\d|\.\d)'
+
+        # Compile once: all date formats in one alternation (same order as
+        # above, so MM/DD/YYYY wins over MM/DD/YY), plus the amount pattern.
+        # Group N+1 matching means the date is in _DATE_FORMATS[N].
+        # Dates must start a line or follow whitespace, which rules out
+        # most start positions inside digit runs on non-matching lines.
+        self._date_re = re.compile(
+            r'(?<!\S)(?:' + '|'.join(f'({p})' for p in self.date_patterns) + ')'
+        )
+        self._amount_re = re.compile(self.amount_pattern)
+
+    def extract_text_pymupdf(
+        self,
+        doc: "fitz.Document",
+        num_workers: int = min(os.cpu_count() or 1, 4)
+    ) -> Iterator[str]:
         """
         Extract text from PDF using PyMuPDF (fast)
 
+        Yields one string per text block (PyMuPDF keeps a table row's
+        text together in a block), so no giant per-document string is built.
+        Long PDFs are split into page ranges extracted by a process pool.
+
         Args:
-            pdf_path: Path to the PDF file
+            doc: Open PyMuPDF document
+            num_workers: Max worker processes for long PDFs
+
+        Yields:
+            Text of each text block, in page order
+        """
+        page_count = doc.page_count
+        if page_count < PARALLEL_PAGE_THRESHOLD or num_workers <= 1:
+            for page in doc:
+                yield from _page_text_blocks(page)
+            return
+
+        # Workers reopen the file by name; the open doc can't be shared
+        pdf_path = doc.name
+
+        # Contiguous page ranges, one per worker, yielded back in page order
+        chunk_size = -(-page_count // num_workers)
+        page_ranges = [
+            list(range(start, min(start + chunk_size, page_count)))
+            for start in range(0, page_count, chunk_size)
+        ]
+
+        # Spawn rather than fork: the app calls this from a worker thread
+        # while other threads (embedding model pools) are running
+        with ProcessPoolExecutor(
+            max_workers=len(page_ranges),
+            mp_context=multiprocessing.get_context("spawn")
+        ) as pool:
+            for blocks in pool.map(_extract_pages, [pdf_path] * len(page_ranges), page_ranges):
+                yield from blocks
+
+    def extract_tables_pymupdf(self, doc: "fitz.Document") -> List[pd.DataFrame]:
+        """
+        Extract tables from PDF using PyMuPDF's native table finder (fast)
+
+        Args:
+            doc: Open PyMuPDF document
 
         Returns:
-            Extracted text as string
+            List of DataFrames, one per table found
         """
-        text = ""
-        doc = fitz.open(pdf_path)
+        tables = []
 
         for page in doc:
-            text += page.get_text()
+            for table in page.find_tables().tables:
+                rows = table.extract()
+                if rows:
+                    df = pd.DataFrame(rows[1:], columns=rows[0])
+                    tables.append(df)
 
-        doc.close()
-        return text
+        return tables
 
     def extract_tables_pdfplumber(self, pdf_path: str) -> List[pd.DataFrame]:
         """
@@ -78,6 +208,8 @@ class PDFProcessor:
         Returns:
             List of DataFrames, one per table found
         """
+        import pdfplumber
+
         tables = []
 
         with pdfplumber.open(pdf_path) as pdf:
@@ -92,7 +224,7 @@ class PDFProcessor:
 
     def parse_transactions_from_text(
         self,
-        text: str,
+        text: Union[str, Iterable[str]],
         file_id: str
     ) -> List[Dict]:
         """
@@ -102,33 +234,21 @@ class PDFProcessor:
         You may need to customize this for specific bank formats.
 
         Args:
-            text: Raw text from PDF
+            text: Raw text from PDF, or an iterable of text blocks
             file_id: Unique ID to track which file this came from
 
         Returns:
             List of transaction dictionaries
         """
         transactions = []
-        lines = text.split('\n')
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-
-            # Try to find a date in the line
-            date_match = None
-            for pattern in self.date_patterns:
-                match = re.search(pattern, line)
-                if match:
-                    date_match = match.group()
-                    break
-
-            if not date_match:
-                continue
+        blocks = [text] if isinstance(text, str) else text
+        dated_lines = chain.from_iterable(
+            self._iter_dated_lines(block) for block in blocks
+        )
 
+        for line, date_match, date_format in dated_lines:
             # Try to find an amount
-            amounts = re.findall(self.amount_pattern, line)
+            amounts = self._amount_re.findall(line)
             if not amounts:
                 continue
 
@@ -142,12 +262,12 @@ class PDFProcessor:
             description = line[desc_start:desc_end].strip()
 
             # Clean up description
-            description = re.sub(r'\s+', ' ', description)
+            description = _WS_RE.sub(' ', description)
             description = description.strip('- ')
 
             if description and amount != 0:
                 transactions.append({
-                    "date": self._normalize_date(date_match),
+                    "date": self._normalize_date(date_match, date_format),
                     "description": description.upper(),
                     "amount": amount,
                     "type": "credit" if amount > 0 else "debit",
@@ -157,39 +277,53 @@ class PDFProcessor:
 
         return transactions
 
+    def _iter_dated_lines(self, text: str):
+        """
+        Yield (line, first_date, date_format) for every line with a date
+
+        One finditer pass over the whole text finds the dates; lines without
+        a date (headers, addresses, footers) are never split out or touched
+        in Python.
+        """
+        next_line_start = 0
+
+        for match in self._date_re.finditer(text):
+            # Only the first date of each line counts
+            if match.start() < next_line_start:
+                continue
+
+            line_start = text.rfind('\n', 0, match.start()) + 1
+            line_end = text.find('\n', match.end())
+            if line_end == -1:
+                line_end = len(text)
+            next_line_start = line_end + 1
+
+            date_format = _DATE_FORMATS[match.lastindex - 1]
+            yield text[line_start:line_end].strip(), match.group(), date_format
+
     def _parse_amount(self, amount_str: str) -> float:
         """Convert amount string to float"""
         # Remove $ and commas
-        clean = amount_str.replace('$', '').replace(',', '')
         try:
-            return float(clean)
+            return float(amount_str.translate(_AMOUNT_STRIP))
         except ValueError:
             return 0.0
 
-    def _normalize_date(self, date_str: str) -> str:
+    def _normalize_date(self, date_str: str, first_format: Optional[str] = None) -> str:
         """Convert various date formats to YYYY-MM-DD"""
-        formats_to_try = [
-            '%m/%d/%Y',
-            '%m/%d/%y',
-            '%Y-%m-%d',
-            '%m-%d-%Y',
-        ]
-
-        for fmt in formats_to_try:
-            try:
-                dt = datetime.strptime(date_str, fmt)
-                return dt.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-
-        return date_str  # Return as-is if can't parse
+        return _normalize_date(date_str, first_format)
 
-    def process_pdf(self, pdf_path: str) -> Dict:
+    def process_pdf(
+        self,
+        pdf_path: str,
+        num_workers: int = min(os.cpu_count() or 1, 4)
+    ) -> Dict:
         """
         Main method to process a PDF bank statement
 
         Args:
             pdf_path: Path to the PDF file
+            num_workers: Max worker processes for text extraction
 
         Returns:
             Dictionary with:
@@ -198,19 +332,26 @@ class PDFProcessor:
             - raw_text: Original extracted text
             - success: Whether parsing was successful
         """
+        import fitz  # PyMuPDF
+
         file_id = str(uuid.uuid4())[:8]  # Short unique ID
 
         try:
-            # Try table extraction first (more accurate for structured PDFs)
-            tables = self.extract_tables_pdfplumber(pdf_path)
-
-            if tables:
-                # If tables found, parse from tables
-                transactions = self._parse_from_tables(tables, file_id)
-            else:
-                # Fall back to text extraction
-                text = self.extract_text_pymupdf(pdf_path)
-                transactions = self.parse_transactions_from_text(text, file_id)
+            # Open the PDF once and share it between table and text extraction
+            with fitz.open(pdf_path) as doc:
+                # Try table extraction first (more accurate for structured PDFs);
+                # pdfplumber is much slower, so only use it if PyMuPDF finds nothing
+                tables = self.extract_tables_pymupdf(doc)
+                if not tables:
+                    tables = self.extract_tables_pdfplumber(pdf_path)
+
+                if tables:
+                    # If tables found, parse from tables
+                    transactions = self._parse_from_tables(tables, file_id)
+                else:
+                    # Fall back to text extraction, block by block
+                    blocks = self.extract_text_pymupdf(doc, num_workers)
+                    transactions = self.parse_transactions_from_text(blocks, file_id)
 
             return {
                 "file_id": file_id,
@@ -249,24 +390,33 @@ class PDFProcessor:
             if date_col is None or amount_col is None:
                 continue
 
-            for _, row in df.iterrows():
-                try:
-                    date_val = str(row.iloc[date_col]) if date_col is not None else ""
-                    desc_val = str(row.iloc[desc_col]) if desc_col is not None else ""
-                    amount_val = str(row.iloc[amount_col]) if amount_col is not None else "0"
-
-                    amount = self._parse_amount(amount_val)
-
-                    if amount != 0:
-                        transactions.append({
-                            "date": self._normalize_date(date_val),
-                            "description": desc_val.upper(),
-                            "amount": amount,
-                            "type": "credit" if amount > 0 else "debit",
-                            "file_id": file_id
-                        })
-                except Exception:
-                    continue
+            # Column-wise parsing instead of boxing every row with iterrows()
+            amounts = pd.to_numeric(
+                df.iloc[:, amount_col].astype(str)
+                .str.replace(r"[$,]", "", regex=True)
+                .str.strip(),
+                errors="coerce"
+            ).fillna(0.0)
+
+            mask = amounts != 0
+            if not mask.any():
+                continue
+
+            amounts = amounts[mask]
+            dates = df.iloc[:, date_col][mask].astype(str)
+            if desc_col is not None:
+                descriptions = df.iloc[:, desc_col][mask].astype(str).str.upper()
+            else:
+                descriptions = ""
+
+            parsed = pd.DataFrame({
+                "date": dates.map(self._normalize_date),
+                "description": descriptions,
+                "amount": amounts.astype(float),
+                "type": np.where(amounts > 0, "credit", "debit"),
+                "file_id": file_id
+            })
+            transactions.extend(parsed.to_dict("records"))
 
         return transactions
 
@@ -299,17 +449,11 @@ def load_demo_data(csv_path: str, file_id: str = "demo") -> List[Dict]:
     """
     df = pd.read_csv(csv_path)
 
-    transactions = []
-    for _, row in df.iterrows():
-        transactions.append({
-            "date": row["date"],
-            "description": row["description"].upper(),
-            "amount": float(row["amount"]),
-            "type": row["type"],
-            "file_id": file_id
-        })
-
-    return transactions
+    df["description"] = df["description"].str.upper()
+    df["amount"] = df["amount"].astype(float)
+    df["file_id"] = file_id
+
+    return df[["date", "description", "amount", "type", "file_id"]].to_dict("records")
 
 
 # ===================
@@ -23,8 +23,12 @@ User: "How much did I spend on food?"
 """
 
 import os
-from typing import List, Dict, Optional
+import heapq
+import traceback
+from collections import defaultdict
+from typing import List, Dict, Optional, Iterator, Union
 
+import pandas as pd
 from groq import Groq
 from llama_index.llms.groq import Groq as LlamaIndexGroq
 from llama_index.core import Settings
@@ -32,6 +36,61 @@ from llama_index.core import Settings
 from vector_store import FinanceVectorStore
 
 
+# Transactions listed per category in the LLM context
+MAX_LISTED_PER_CATEGORY = 5
+
+# Categories listed in the LLM context
+MAX_CONTEXT_CATEGORIES = 10
+
+# Static part of the system prompt. It is sent first and is identical
+# for every user, so the provider can reuse its cached prefix; the
+# per-user income line (if any) is appended at the end.
+_SYSTEM_PROMPT_BASE = """You are a friendly personal finance advisor AI named Finley. You help users understand their spending and make smarter financial decisions.
+
+IMPORTANT - BE INTELLIGENT ABOUT RESPONSES:
+
+1. FOR GREETINGS (hi, hello, hey, good morning, etc.):
+   - Greet them back warmly
+   - Introduce yourself as Finley
+   - Ask how you can help with their finances
+   - DO NOT dump financial data for greetings!
+
+   Example: "Hey! I'm Finley, your personal finance advisor. How can I help you today?"
+
+2. FOR "WHO CREATED YOU" / "WHO MADE YOU" / "WHO BUILT YOU":
+   - Say you were created by Saikrishna
+   - Example: "I was created by Saikrishna! I'm here to help you manage your finances."
+
+3. FOR FINANCIAL QUESTIONS (how much, what, show me, etc.):
+   - Give specific numbers from the data
+   - Be concise - don't overwhelm with info
+   - Add one helpful tip at the end
+
+4. FOR VAGUE QUESTIONS:
+   - Ask clarifying questions
+   - Suggest what you can help with
+
+TONE:
+- Friendly and conversational
+- Concise - don't write essays
+- Smart - understand user intent
+
+NEVER:
+- Give financial data in response to greetings
+- Mention your creator unless specifically asked
+- Write overly long responses"""
+
+# Shared message prefix for users without an income set
+_DEFAULT_MESSAGES_PREFIX = [{"role": "system", "content": _SYSTEM_PROMPT_BASE}]
+
+
+def _income_line(monthly_income: float) -> str:
+    """Income line for the system prompt (empty if income is unknown)"""
+    if monthly_income > 0:
+        return f"User's monthly income: ${monthly_income:,.2f}"
+    return ""
+
+
 class FinanceQueryEngine:
     """
     Query engine for the Finance Advisor using Groq LLM
@@ -76,62 +135,40 @@ class FinanceQueryEngine:
         # Set as default for LlamaIndex
         Settings.llm = self.llm
 
-        # System prompt for the finance advisor
-        self.system_prompt = self._build_system_prompt()
+        # System prompt for the finance advisor (rebuilt only on income change)
+        self._refresh_system_prompt()
 
     def _build_system_prompt(self) -> str:
         """Build the system prompt for the finance advisor"""
-        income_context = ""
-        if self.monthly_income > 0:
-            income_context = f"User's monthly income: ${self.monthly_income:,.2f}"
-
-        return f"""You are a friendly personal finance advisor AI named Finley. You help users understand their spending and make smarter financial decisions.
-
-{income_context}
-
-IMPORTANT - BE INTELLIGENT ABOUT RESPONSES:
-
-1. FOR GREETINGS (hi, hello, hey, good morning, etc.):
-   - Greet them back warmly
-   - Introduce yourself as Finley
-   - Ask how you can help with their finances
-   - DO NOT dump financial data for greetings!
-
-   Example: "Hey! I'm Finley, your personal finance advisor. How can I help you today?"
+        income_context = _income_line(self.monthly_income)
+        if not income_context:
+            return _SYSTEM_PROMPT_BASE
 
-2. FOR "WHO CREATED YOU" / "WHO MADE YOU" / "WHO BUILT YOU":
-   - Say you were created by Saikrishna
-   - Example: "I was created by Saikrishna! I'm here to help you manage your finances."
+        return f"{_SYSTEM_PROMPT_BASE}\n\n{income_context}"
 
-3. FOR FINANCIAL QUESTIONS (how much, what, show me, etc.):
-   - Give specific numbers from the data
-   - Be concise - don't overwhelm with info
-   - Add one helpful tip at the end
-
-4. FOR VAGUE QUESTIONS:
-   - Ask clarifying questions
-   - Suggest what you can help with
-
-TONE:
-- Friendly and conversational
-- Concise - don't write essays
-- Smart - understand user intent
+    def _refresh_system_prompt(self):
+        """Rebuild the cached system prompt and the message prefix using it"""
+        self.system_prompt = self._build_system_prompt()
 
-NEVER:
-- Give financial data in response to greetings
-- Mention your creator unless specifically asked
-- Write overly long responses"""
+        if self.system_prompt == _SYSTEM_PROMPT_BASE:
+            self._messages_prefix = _DEFAULT_MESSAGES_PREFIX
+        else:
+            self._messages_prefix = [{"role": "system", "content": self.system_prompt}]
 
     def update_income(self, monthly_income: float):
         """Update the user's monthly income"""
+        if monthly_income == self.monthly_income:
+            return
+
         self.monthly_income = monthly_income
-        self.system_prompt = self._build_system_prompt()
+        self._refresh_system_prompt()
 
     def query(
         self,
         question: str,
         top_k: int = 20,
-        category_filter: Optional[str] = None
+        category_filter: Optional[str] = None,
+        stream: bool = False
     ) -> Dict:
         """
         Answer a question about the user's finances
@@ -140,6 +177,8 @@ NEVER:
             question: User's question
             top_k: Number of transactions to retrieve
             category_filter: Optional category to filter by
+            stream: If True, return stream_query() output instead
+                    (answer_stream iterator rather than answer string)
 
         Returns:
             Dictionary with:
@@ -147,52 +186,20 @@ NEVER:
             - transactions_used: Relevant transactions found
             - query: Original question
         """
-        try:
-            # Step 1: Check if index is loaded
-            if self.vector_store.index is None:
-                print("[QUERY] Index not loaded, attempting to reload...")
-                self.vector_store.index = self.vector_store._load_existing_index()
-                if self.vector_store.index is None:
-                    return {
-                        "answer": "No transaction data available. Please load demo data or upload a PDF first.",
-                        "transactions_used": 0,
-                        "transactions": [],
-                        "query": question
-                    }
-
-            # Step 2: Retrieve relevant transactions
-            relevant_txns = self.vector_store.search(
-                query=question,
-                top_k=top_k,
-                category_filter=category_filter
-            )
-            print(f"[QUERY] Found {len(relevant_txns)} relevant transactions")
-
-            # Step 3: Build context from transactions
-            context = self._build_context(relevant_txns)
+        if stream:
+            return self.stream_query(question, top_k, category_filter)
 
-            # Step 4: Generate response with Groq
-            messages = [
-                {"role": "system", "content": self.system_prompt},
-                {"role": "user", "content": f"""
-Based on the following transaction data, please answer this question:
-
-QUESTION: {question}
-
-RELEVANT TRANSACTIONS:
-{context}
-
-Please provide a helpful, specific answer based on this data."""}
-            ]
+        try:
+            # Steps 1-3: Retrieve transactions and build the prompt
+            prepared = self._prepare_messages(question, top_k, category_filter)
+            if prepared is None:
+                return self._no_data_result(question)
 
-            response = self.groq_client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=0.1,
-                max_tokens=1024
-            )
+            messages, relevant_txns = prepared
 
-            answer = response.choices[0].message.content
+            # Step 4: Generate response with Groq (same streaming call as
+            # stream_query, collected into one string)
+            answer = "".join(self._stream_completion(messages))
 
             return {
                 "answer": answer,
@@ -203,7 +210,6 @@ Please provide a helpful, specific answer based on this data."""}
 
         except Exception as e:
             print(f"[QUERY ERROR] {str(e)}")
-            import traceback
             traceback.print_exc()
             return {
                 "answer": f"Error processing your question: {str(e)}",
@@ -212,27 +218,163 @@ Please provide a helpful, specific answer based on this data."""}
                 "query": question
             }
 
+    def stream_query(
+        self,
+        question: str,
+        top_k: int = 20,
+        category_filter: Optional[str] = None
+    ) -> Dict:
+        """
+        Like query(), but stream the answer as it is generated
+
+        Retrieval happens up front so the metadata is available right away;
+        the LLM call starts when answer_stream is first iterated.
+
+        Args:
+            question: User's question
+            top_k: Number of transactions to retrieve
+            category_filter: Optional category to filter by
+
+        Returns:
+            Dictionary with:
+            - answer_stream: Iterator of answer text chunks
+            - transactions_used: Relevant transactions found
+            - transactions: Up to 10 of those transactions
+            - query: Original question
+        """
+        try:
+            prepared = self._prepare_messages(question, top_k, category_filter)
+        except Exception as e:
+            print(f"[QUERY ERROR] {str(e)}")
+            traceback.print_exc()
+            return {
+                "answer_stream": iter([f"Error processing your question: {str(e)}"]),
+                "transactions_used": 0,
+                "transactions": [],
+                "query": question
+            }
+
+        if prepared is None:
+            result = self._no_data_result(question)
+            result["answer_stream"] = iter([result.pop("answer")])
+            return result
+
+        messages, relevant_txns = prepared
+
+        return {
+            "answer_stream": self._stream_answer(messages),
+            "transactions_used": len(relevant_txns),
+            "transactions": relevant_txns[:10],
+            "query": question
+        }
+
+    def _stream_answer(self, messages: List[Dict]) -> Iterator[str]:
+        """
+        Like _stream_completion, but an error ends the stream with a message
+
+        Text streamed before the error is kept, and the error is logged.
+        """
+        try:
+            yield from self._stream_completion(messages)
+        except Exception as e:
+            print(f"[QUERY ERROR] {str(e)}")
+            traceback.print_exc()
+            yield f"\n\nError processing your question: {str(e)}"
+
+    def _stream_completion(self, messages: List[Dict]) -> Iterator[str]:
+        """Yield answer chunks from a streaming Groq completion"""
+        stream = self.groq_client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=0.1,
+            max_tokens=1024,
+            stream=True
+        )
+
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+
+    def _prepare_messages(
+        self,
+        question: str,
+        top_k: int,
+        category_filter: Optional[str]
+    ) -> Optional[tuple]:
+        """
+        Retrieve relevant transactions and build the chat messages
+
+        Returns:
+            (messages, relevant_txns), or None if no index is available
+        """
+        # Step 1: Check if index is loaded
+        if self.vector_store.index is None:
+            print("[QUERY] Index not loaded, attempting to reload...")
+            self.vector_store.index = self.vector_store._load_existing_index()
+            if self.vector_store.index is None:
+                return None
+
+        # Step 2: Retrieve relevant transactions
+        relevant_txns = self.vector_store.search(
+            query=question,
+            top_k=top_k,
+            category_filter=category_filter
+        )
+        print(f"[QUERY] Found {len(relevant_txns)} relevant transactions")
+
+        # Step 3: Build context from transactions
+        context = self._build_context(relevant_txns)
+
+        messages = self._messages_prefix + [
+            {"role": "user", "content": f"""
+Based on the following transaction data, please answer this question:
+
+QUESTION: {question}
+
+RELEVANT TRANSACTIONS:
+{context}
+
+Please provide a helpful, specific answer based on this data."""}
+        ]
+
+        return messages, relevant_txns
+
+    def _no_data_result(self, question: str) -> Dict:
+        """Result returned when no transactions have been indexed yet"""
+        return {
+            "answer": "No transaction data available. Please load demo data or upload a PDF first.",
+            "transactions_used": 0,
+            "transactions": [],
+            "query": question
+        }
+
     def _build_context(self, transactions: List[Dict]) -> str:
         """Build context string from transactions"""
         if not transactions:
             return "No relevant transactions found."
 
-        # Group by category for better context
-        by_category = {}
+        # Group by category for better context, keeping only the
+        # transactions we will actually list
+        by_category = defaultdict(
+            lambda: {"transactions": [], "total": 0, "count": 0, "icon": None}
+        )
         total_amount = 0
 
         for tx in transactions:
-            category = tx.get("category", "other")
-            if category not in by_category:
-                by_category[category] = {
-                    "transactions": [],
-                    "total": 0,
-                    "icon": tx.get("icon", "📦")
-                }
-
-            by_category[category]["transactions"].append(tx)
-            by_category[category]["total"] += tx.get("amount", 0)
-            total_amount += tx.get("amount", 0)
+            amount = tx.get("amount", 0)
+            entry = by_category[tx.get("category", "other")]
+
+            if entry["icon"] is None:
+                entry["icon"] = tx.get("icon", "📦")
+            entry["count"] += 1
+            entry["total"] += amount
+            total_amount += amount
+
+            if len(entry["transactions"]) < MAX_LISTED_PER_CATEGORY:
+                entry["transactions"].append(tx)
 
         # Build context string
         context_parts = []
@@ -246,25 +388,36 @@ Please provide a helpful, specific answer based on this data."""}
 
         context_parts.append("")
 
-        # By category
-        for category, data in sorted(by_category.items(), key=lambda x: abs(x[1]["total"]), reverse=True):
+        # By category (largest absolute totals first, capped)
+        top_categories = heapq.nlargest(
+            MAX_CONTEXT_CATEGORIES,
+            by_category.items(),
+            key=lambda x: abs(x[1]["total"])
+        )
+
+        for category, data in top_categories:
             icon = data["icon"]
             total = data["total"]
-            count = len(data["transactions"])
+            count = data["count"]
 
             context_parts.append(f"{icon} {category.upper()}: ${total:,.2f} ({count} transactions)")
 
-            # List individual transactions
-            for tx in data["transactions"][:5]:  # Limit to 5 per category
+            # List individual transactions (already capped per category)
+            for tx in data["transactions"]:
                 context_parts.append(
                     f"   • {tx['date']} - {tx['description'][:40]} - ${tx['amount']:,.2f}"
                 )
 
-            if count > 5:
-                context_parts.append(f"   ... and {count - 5} more")
+            if count > MAX_LISTED_PER_CATEGORY:
+                context_parts.append(f"   ... and {count - MAX_LISTED_PER_CATEGORY} more")
 
             context_parts.append("")
 
+        if len(by_category) > MAX_CONTEXT_CATEGORIES:
+            context_parts.append(
+                f"... and {len(by_category) - MAX_CONTEXT_CATEGORIES} other categories"
+            )
+
         return "\n".join(context_parts)
 
     def get_spending_summary(self) -> Dict:
@@ -279,18 +432,24 @@ Please provide a helpful, specific answer based on this data."""}
             top_k=1000  # Get as many as possible
         )
 
+        # Columnar view of the results for vectorized aggregation
+        df = pd.DataFrame(all_expenses, columns=["amount", "category", "icon"])
+        df = df.fillna({"category": "other", "icon": "📦"})
+
         # Calculate totals
-        total_expenses = sum(tx["amount"] for tx in all_expenses if tx["amount"] < 0)
-        total_income = sum(tx["amount"] for tx in all_expenses if tx["amount"] > 0)
-
-        # Group by category
-        by_category = {}
-        for tx in all_expenses:
-            cat = tx.get("category", "other")
-            if cat not in by_category:
-                by_category[cat] = {"total": 0, "count": 0, "icon": tx.get("icon", "📦")}
-            by_category[cat]["total"] += tx["amount"]
-            by_category[cat]["count"] += 1
+        total_expenses = float(df.loc[df["amount"] < 0, "amount"].sum())
+        total_income = float(df.loc[df["amount"] > 0, "amount"].sum())
+
+        # Group by category (first-seen order, like the old dict build)
+        by_category = (
+            df.groupby("category", sort=False)
+            .agg(
+                total=("amount", "sum"),
+                count=("amount", "size"),
+                icon=("icon", "first")
+            )
+            .to_dict("index")
+        )
 
         return {
             "total_expenses": total_expenses,
@@ -306,24 +465,25 @@ Please provide a helpful, specific answer based on this data."""}
     def ask_with_context(
         self,
         question: str,
-        additional_context: str = ""
-    ) -> str:
+        additional_context: str = "",
+        stream: bool = False
+    ) -> Union[str, Iterator[str]]:
         """
         Ask a question with additional context (for follow-up questions)
 
         Args:
             question: User's question
             additional_context: Additional context from previous queries
+            stream: If True, return an iterator of answer chunks
 
         Returns:
-            Generated answer string
+            Generated answer string (or chunk iterator when streaming)
         """
         # Retrieve relevant transactions
         relevant_txns = self.vector_store.search(question, top_k=15)
         context = self._build_context(relevant_txns)
 
-        messages = [
-            {"role": "system", "content": self.system_prompt},
+        messages = self._messages_prefix + [
             {"role": "user", "content": f"""
 {additional_context}
 
@@ -336,14 +496,11 @@ TRANSACTIONS:
 """}
         ]
 
-        response = self.groq_client.chat.completions.create(
-            model=self.model,
-            messages=messages,
-            temperature=0.1,
-            max_tokens=1024
-        )
+        chunks = self._stream_completion(messages)
+        if stream:
+            return chunks
 
-        return response.choices[0].message.content
+        return "".join(chunks)
 
 
 # ===================
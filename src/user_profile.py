@@ -19,11 +19,19 @@ User sets income to $5000
 On restart, all settings are loaded from user_profile.json
 """
 
-import json
+import os
+from contextlib import contextmanager
 from typing import Dict, List, Optional
 from pathlib import Path
 from datetime import datetime
 
+import orjson
+
+
+def _now() -> str:
+    """Current local time as an ISO 8601 string"""
+    return datetime.now().isoformat()
+
 
 class UserProfile:
     """
@@ -44,33 +52,88 @@ class UserProfile:
         """
         self.profile_path = Path(profile_path)
         self.profile = self._load_profile()
+        self.profile.setdefault("uploaded_files", [])
+
+        # file_id -> file info, kept in sync with profile["uploaded_files"]
+        self._files_by_id: Dict[str, Dict] = {}
+        self._reindex_files()
+
+        # Write batching (see batch()); one timestamp is shared per batch
+        self._batch_depth = 0
+        self._batch_now: Optional[str] = None
+        self._dirty = False
 
     def _load_profile(self) -> Dict:
         """Load profile from JSON file"""
         if self.profile_path.exists():
             try:
-                with open(self.profile_path, 'r') as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
+                return orjson.loads(self.profile_path.read_bytes())
+            except orjson.JSONDecodeError:
                 pass
 
         # Default profile
+        now = _now()
         return {
             "monthly_income": 0,
             "uploaded_files": [],
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": now,
+            "updated_at": now
         }
 
-    def _save_profile(self):
-        """Save profile to JSON file"""
-        self.profile["updated_at"] = datetime.now().isoformat()
+    def _reindex_files(self):
+        """Rebuild the file_id index from the uploaded files list"""
+        self._files_by_id = {
+            f["file_id"]: f for f in self.profile["uploaded_files"]
+        }
+
+    def _timestamp(self) -> str:
+        """Timestamp for the current operation (shared within a batch)"""
+        return self._batch_now or _now()
+
+    def _save_profile(self, now: Optional[str] = None):
+        """Save profile to JSON file (deferred while inside batch())"""
+        if self._batch_depth > 0:
+            self._dirty = True
+            return
+
+        self.profile["updated_at"] = now or self._timestamp()
 
         # Ensure directory exists
         self.profile_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(self.profile_path, 'w') as f:
-            json.dump(self.profile, f, indent=2)
+        # Write to a temp file and swap it in, so a crash never leaves
+        # a half-written profile behind
+        tmp_path = self.profile_path.with_name(self.profile_path.name + ".tmp")
+        tmp_path.write_bytes(orjson.dumps(self.profile, option=orjson.OPT_INDENT_2))
+        os.replace(tmp_path, self.profile_path)
+
+        self._dirty = False
+
+    def flush(self):
+        """Write pending changes to disk, if any"""
+        if self._dirty:
+            self._save_profile()
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several updates into a single disk write
+
+        Usage:
+            with profile.batch():
+                profile.remove_file("demo")
+                profile.add_file("demo", "sample_transactions.csv", 58)
+        """
+        if self._batch_depth == 0:
+            self._batch_now = _now()
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+                self._batch_now = None
 
     # ===================
     # INCOME MANAGEMENT
@@ -87,6 +150,10 @@ class UserProfile:
         Args:
             income: Monthly income amount
         """
+        # Skip the disk write if nothing changed
+        if self.profile.get("monthly_income") == income:
+            return
+
         self.profile["monthly_income"] = income
         self._save_profile()
         print(f"Updated monthly income to ${income:,.2f}")
@@ -112,21 +179,24 @@ class UserProfile:
         Returns:
             File info dictionary
         """
+        now = self._timestamp()
         file_info = {
             "file_id": file_id,
             "filename": filename,
             "transaction_count": transaction_count,
-            "uploaded_at": datetime.now().isoformat()
+            "uploaded_at": now
         }
 
-        # Avoid duplicates
-        self.profile["uploaded_files"] = [
-            f for f in self.profile.get("uploaded_files", [])
-            if f["file_id"] != file_id
-        ]
+        # Avoid duplicates (re-uploads move to the end of the list)
+        if file_id in self._files_by_id:
+            self.profile["uploaded_files"] = [
+                f for f in self.profile["uploaded_files"]
+                if f["file_id"] != file_id
+            ]
 
         self.profile["uploaded_files"].append(file_info)
-        self._save_profile()
+        self._files_by_id[file_id] = file_info
+        self._save_profile(now)
 
         return file_info
 
@@ -140,19 +210,33 @@ class UserProfile:
         Returns:
             True if file was found and removed
         """
-        original_count = len(self.profile.get("uploaded_files", []))
+        return self.remove_files([file_id]) > 0
 
-        self.profile["uploaded_files"] = [
-            f for f in self.profile.get("uploaded_files", [])
-            if f["file_id"] != file_id
-        ]
+    def remove_files(self, file_ids: List[str]) -> int:
+        """
+        Remove several files from tracking with a single save
 
-        removed = len(self.profile["uploaded_files"]) < original_count
+        Args:
+            file_ids: IDs of files to remove
 
-        if removed:
-            self._save_profile()
+        Returns:
+            Number of files removed
+        """
+        # Only touch the list if something is actually tracked
+        ids = {
+            file_id for file_id in file_ids
+            if self._files_by_id.pop(file_id, None) is not None
+        }
+        if not ids:
+            return 0
+
+        self.profile["uploaded_files"] = [
+            f for f in self.profile["uploaded_files"]
+            if f["file_id"] not in ids
+        ]
+        self._save_profile()
 
-        return removed
+        return len(ids)
 
     def get_files(self) -> List[Dict]:
         """Get list of all uploaded files"""
@@ -160,10 +244,7 @@ class UserProfile:
 
     def get_file_by_id(self, file_id: str) -> Optional[Dict]:
         """Get file info by file_id"""
-        for f in self.profile.get("uploaded_files", []):
-            if f["file_id"] == file_id:
-                return f
-        return None
+        return self._files_by_id.get(file_id)
 
     def get_total_transactions(self) -> int:
         """Get total transaction count across all files"""
@@ -188,18 +269,24 @@ class UserProfile:
 
     def clear_all_files(self):
         """Remove all tracked files"""
+        if not self.profile.get("uploaded_files"):
+            return
+
         self.profile["uploaded_files"] = []
+        self._files_by_id = {}
         self._save_profile()
 
     def reset_profile(self):
         """Reset profile to defaults"""
+        now = self._timestamp()
         self.profile = {
             "monthly_income": 0,
             "uploaded_files": [],
-            "created_at": self.profile.get("created_at", datetime.now().isoformat()),
-            "updated_at": datetime.now().isoformat()
+            "created_at": self.profile.get("created_at", now),
+            "updated_at": now
         }
-        self._save_profile()
+        self._files_by_id = {}
+        self._save_profile(now)
 
 
 # ===================
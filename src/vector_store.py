@@ -28,6 +28,9 @@ HOW IT WORKS:
 """
 
 import os
+import asyncio
+import threading
+from functools import lru_cache
 from typing import List, Dict, Optional
 from pathlib import Path
 
@@ -37,20 +40,99 @@ from llama_index.core import (
     StorageContext,
     Settings,
 )
-from llama_index.core.schema import TextNode
+from llama_index.core.schema import TextNode, MetadataMode
+from llama_index.core.vector_stores import MetadataFilters, MetadataFilter
 from llama_index.embeddings.huggingface import HuggingFaceEmbedding
 from llama_index.vector_stores.qdrant import QdrantVectorStore
 
-from qdrant_client import QdrantClient
+import grpc
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from qdrant_client.http.exceptions import UnexpectedResponse
 from qdrant_client.models import (
     Distance,
     VectorParams,
     Filter,
     FieldCondition,
     MatchValue,
+    MatchAny,
     PayloadSchemaType,
+    OptimizersConfigDiff,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
 )
 
+from embedding_cache import EmbeddingCache
+
+# Qdrant's gRPC port (Qdrant Cloud serves gRPC over TLS here)
+GRPC_PORT = 6334
+
+# Known embedding sizes, so creating a collection needn't run the model
+_MODEL_DIMS = {
+    "sentence-transformers/all-MiniLM-L6-v2": 384,
+    "sentence-transformers/all-MiniLM-L12-v2": 384,
+    "sentence-transformers/all-mpnet-base-v2": 768,
+    "BAAI/bge-small-en-v1.5": 384,
+    "BAAI/bge-base-en-v1.5": 768,
+}
+
+# Texts per embedding forward pass
+EMBED_BATCH_SIZE = 64
+
+# Node metadata kept out of the embedded text
+EMBED_EXCLUDED_KEYS = ["date", "description", "amount", "category", "icon", "type", "file_id"]
+
+# Payload fields indexed for filtering
+PAYLOAD_INDEXES = {
+    "file_id": PayloadSchemaType.KEYWORD,   # deletion
+    "category": PayloadSchemaType.KEYWORD,  # category filters
+    "type": PayloadSchemaType.KEYWORD,      # debit / credit
+    "date": PayloadSchemaType.DATETIME,     # date ranges
+    "amount": PayloadSchemaType.FLOAT,      # amount thresholds
+}
+
+# Max unique file_ids returned by a single facet request
+FACET_LIMIT = 1000
+
+# Bulk upload tuning: points per upsert request, requests in flight
+UPLOAD_BATCH_SIZE = 64
+UPLOAD_CONCURRENCY = 8
+
+
+def _is_not_found(error: Exception) -> bool:
+    """True if a Qdrant call failed because the collection doesn't exist"""
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404
+    if isinstance(error, grpc.RpcError):
+        return error.code() == grpc.StatusCode.NOT_FOUND
+    return False
+
+
+@lru_cache(maxsize=256)
+def _file_filter(file_id: str) -> Filter:
+    """Qdrant filter matching one file_id (cached; treat as read-only)"""
+    return Filter(
+        must=[
+            FieldCondition(
+                key="file_id",
+                match=MatchValue(value=file_id)
+            )
+        ]
+    )
+
+
+@lru_cache(maxsize=256)
+def _search_filters(
+    category: Optional[str], file_id: Optional[str]
+) -> Optional[MetadataFilters]:
+    """Retriever filters for search() (cached; treat as read-only)"""
+    conditions = [
+        MetadataFilter(key=key, value=value)
+        for key, value in (("category", category), ("file_id", file_id))
+        if value
+    ]
+    return MetadataFilters(filters=conditions) if conditions else None
+
 
 class FinanceVectorStore:
     """
@@ -69,7 +151,10 @@ class FinanceVectorStore:
         qdrant_url: str,
         qdrant_api_key: str,
         collection_name: str = "finance_advisor_transactions",
-        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"
+        embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+        embedding_backend: str = "onnx",
+        embedding_cache_path: Optional[str] = None,
+        prefer_grpc: bool = True
     ):
         """
         Initialize vector store with Qdrant Cloud
@@ -79,27 +164,36 @@ class FinanceVectorStore:
             qdrant_api_key: Qdrant Cloud API key
             collection_name: Name of the collection
             embedding_model: HuggingFace model for embeddings
+            embedding_backend: Inference backend ("onnx" or "torch")
+            embedding_cache_path: SQLite file for cached embeddings (optional)
+            prefer_grpc: Talk to Qdrant over gRPC instead of HTTP/JSON
         """
         self.qdrant_url = qdrant_url
         self.qdrant_api_key = qdrant_api_key
         self.collection_name = collection_name
+        self.embedding_model_name = embedding_model
 
         # Initialize Qdrant client (Cloud)
-        self.qdrant_client = QdrantClient(
-            url=qdrant_url,
-            api_key=qdrant_api_key
-        )
+        self.qdrant_client = self._connect(prefer_grpc)
 
         # Initialize embedding model (local, free)
-        self.embed_model = HuggingFaceEmbedding(
-            model_name=embedding_model
-        )
+        self.embed_model = self._load_embed_model(embedding_model, embedding_backend)
+
+        # Run the first (slow) forward pass while Qdrant setup happens
+        threading.Thread(target=self._prewarm_embed_model, daemon=True).start()
+
+        # Embeddings are cached on disk so repeated merchants skip the model
+        try:
+            self.embedding_cache = EmbeddingCache(embedding_model, embedding_cache_path)
+        except Exception as e:
+            print(f"Embedding cache disabled: {e}")
+            self.embedding_cache = None
 
         # Set as default for LlamaIndex
         Settings.embed_model = self.embed_model
 
         # Initialize collection if needed (auto-create)
-        self._init_collection()
+        collection_info = self._init_collection()
 
         # Initialize vector store
         self.vector_store = QdrantVectorStore(
@@ -107,19 +201,93 @@ class FinanceVectorStore:
             collection_name=collection_name,
         )
 
+        # Async upload client, created lazily on its own event loop thread
+        self._upload_loop = None
+        self._upload_lock = threading.Lock()
+        self._async_store = None
+
         # Create storage context
         self.storage_context = StorageContext.from_defaults(
             vector_store=self.vector_store
         )
 
         # Load existing index from Qdrant (if data exists)
-        self.index = self._load_existing_index()
+        # (a just-created collection has no data to load)
+        self.index = (
+            self._load_existing_index(collection_info)
+            if collection_info is not None else None
+        )
+
+    def _connect(self, prefer_grpc: bool) -> QdrantClient:
+        """
+        Create the Qdrant client, preferring gRPC
+
+        gRPC's binary protobuf messages are cheaper to (de)serialize than
+        JSON for upserts and searches. Falls back to HTTP if the gRPC port
+        can't be reached.
+        """
+        self.prefer_grpc = False
+        if prefer_grpc:
+            try:
+                client = QdrantClient(
+                    url=self.qdrant_url,
+                    api_key=self.qdrant_api_key,
+                    prefer_grpc=True,
+                    grpc_port=GRPC_PORT
+                )
+                client.get_collections()
+                self.prefer_grpc = True
+                return client
+            except Exception as e:
+                print(f"Falling back to HTTP for Qdrant (gRPC unavailable: {e})")
+
+        return QdrantClient(
+            url=self.qdrant_url,
+            api_key=self.qdrant_api_key
+        )
+
+    @staticmethod
+    def _load_embed_model(model_name: str, backend: str) -> HuggingFaceEmbedding:
+        """
+        Load the embedding model, preferring ONNX Runtime on CPU
 
-    def _load_existing_index(self):
-        """Load existing index from Qdrant if data exists"""
+        ONNX Runtime's fused kernels give noticeably higher CPU throughput
+        than PyTorch for small sentence-transformers models. Falls back to
+        the PyTorch backend if ONNX Runtime isn't available.
+        """
+        if backend != "torch":
+            try:
+                return HuggingFaceEmbedding(
+                    model_name=model_name,
+                    embed_batch_size=EMBED_BATCH_SIZE,
+                    backend=backend,
+                )
+            except Exception as e:
+                print(f"Falling back to torch embeddings ({backend} unavailable: {e})")
+
+        return HuggingFaceEmbedding(
+            model_name=model_name,
+            embed_batch_size=EMBED_BATCH_SIZE,
+        )
+
+    def _prewarm_embed_model(self):
+        """Embed a dummy batch so the first real upload doesn't pay warm-up"""
+        try:
+            self.embed_model.get_text_embedding_batch(["warm up"] * 8)
+        except Exception as e:
+            print(f"Embedding warm-up failed: {e}")
+
+    def _load_existing_index(self, info=None):
+        """
+        Load existing index from Qdrant if data exists
+
+        Args:
+            info: Collection info already fetched (fetched here if omitted)
+        """
         try:
             # Check if collection has data
-            info = self.qdrant_client.get_collection(self.collection_name)
+            if info is None:
+                info = self.qdrant_client.get_collection(self.collection_name)
             if info.points_count > 0:
                 # Create index from existing vector store
                 index = VectorStoreIndex.from_vector_store(
@@ -132,46 +300,82 @@ class FinanceVectorStore:
         return None
 
     def _init_collection(self):
-        """Create collection if it doesn't exist, with payload indexes"""
-        collections = self.qdrant_client.get_collections().collections
-        collection_names = [c.name for c in collections]
-
-        if self.collection_name not in collection_names:
-            # Get embedding dimension
-            test_embedding = self.embed_model.get_text_embedding("test")
-            embedding_dim = len(test_embedding)
+        """
+        Create collection if it doesn't exist, with payload indexes
 
-            self.qdrant_client.create_collection(
-                collection_name=self.collection_name,
-                vectors_config=VectorParams(
-                    size=embedding_dim,
-                    distance=Distance.COSINE
+        Returns:
+            The existing collection's info, or None if it was just created
+        """
+        # One round-trip both checks existence and fetches the point count
+        try:
+            info = self.qdrant_client.get_collection(self.collection_name)
+        except Exception as e:
+            # Anything but "not found" (auth, timeouts, ...) is a real error
+            if not _is_not_found(e):
+                raise
+        else:
+            # Collections created before an index was added still need it
+            self._create_payload_indexes(info.payload_schema)
+            return info
+
+        # Get embedding dimension (probe the model only if it's unknown)
+        embedding_dim = _MODEL_DIMS.get(self.embedding_model_name)
+        if embedding_dim is None:
+            embedding_dim = len(self.embed_model.get_text_embedding("test"))
+
+        # Full vectors live on disk; int8 copies stay in RAM for search
+        self.qdrant_client.create_collection(
+            collection_name=self.collection_name,
+            vectors_config=VectorParams(
+                size=embedding_dim,
+                distance=Distance.COSINE,
+                on_disk=True
+            ),
+            quantization_config=ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=True
                 )
             )
-            print(f"Created collection: {self.collection_name}")
+        )
+        print(f"Created collection: {self.collection_name}")
 
-            # Create payload indexes for filtering
-            self._create_payload_indexes()
+        # Create payload indexes for filtering
+        self._create_payload_indexes()
+        return None
 
-    def _create_payload_indexes(self):
-        """Create indexes on payload fields for filtering"""
-        try:
-            # Index for file_id (for deletion)
-            self.qdrant_client.create_payload_index(
-                collection_name=self.collection_name,
-                field_name="file_id",
-                field_schema=PayloadSchemaType.KEYWORD
-            )
-            # Index for category (for filtering)
-            self.qdrant_client.create_payload_index(
-                collection_name=self.collection_name,
-                field_name="category",
-                field_schema=PayloadSchemaType.KEYWORD
-            )
-            print(f"Created payload indexes for filtering")
-        except Exception as e:
-            # Indexes may already exist
-            pass
+    def _create_payload_indexes(self, existing: Optional[Dict] = None):
+        """
+        Create indexes on payload fields for filtering
+
+        Without an index Qdrant scans every payload to apply a filter.
+        Dates are stored as ISO 8601 strings (PDFProcessor and the demo
+        CSV both produce YYYY-MM-DD), so the DATETIME index supports
+        date range filters.
+
+        Args:
+            existing: Payload schema of indexes that already exist (skipped)
+        """
+        missing = {
+            field_name: field_schema
+            for field_name, field_schema in PAYLOAD_INDEXES.items()
+            if field_name not in (existing or {})
+        }
+        if not missing:
+            return
+
+        for field_name, field_schema in missing.items():
+            try:
+                self.qdrant_client.create_payload_index(
+                    collection_name=self.collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema
+                )
+            except Exception as e:
+                # Index may already exist
+                pass
+        print(f"Created payload indexes for filtering")
 
     def add_transactions(self, transactions: List[Dict]) -> int:
         """
@@ -192,7 +396,109 @@ class FinanceVectorStore:
         if not transactions:
             return 0
 
-        # Convert transactions to LlamaIndex nodes
+        # Embed everything up front in batches, then upload as-is
+        nodes = self._prepare_nodes(transactions)
+        self.vector_store.add(nodes)
+        self._ensure_index()
+
+        return len(nodes)
+
+    def add_transactions_bulk(
+        self,
+        transactions: List[Dict],
+        batch_size: int = UPLOAD_BATCH_SIZE,
+        concurrency: int = UPLOAD_CONCURRENCY
+    ) -> int:
+        """
+        Add many transactions using batched, concurrent Qdrant uploads
+
+        Small upsert batches with several requests in flight keep each
+        request cheap while hiding network latency, which matters for PDF
+        and demo ingests of hundreds of transactions.
+
+        Args:
+            transactions: List of transaction dictionaries
+            batch_size: Points per upsert request
+            concurrency: Maximum upsert requests in flight
+
+        Returns:
+            Number of transactions added
+        """
+        if not transactions:
+            return 0
+
+        nodes = self._prepare_nodes(transactions)
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop in this thread: upload concurrently on the upload loop
+            asyncio.run_coroutine_threadsafe(
+                self._async_add(nodes, batch_size, concurrency),
+                self._get_upload_loop()
+            ).result()
+        else:
+            # Blocking a running loop on our own would stall it; upload
+            # with the sync client's batched path instead
+            self.vector_store.add(nodes)
+
+        self._ensure_index()
+
+        return len(nodes)
+
+    def _get_upload_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Event loop thread that owns the async Qdrant client
+
+        Created on first bulk upload and reused, so the async client and
+        its connections persist across uploads.
+        """
+        with self._upload_lock:
+            if self._upload_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, daemon=True).start()
+                self._upload_loop = loop
+        return self._upload_loop
+
+    async def _get_async_store(self) -> QdrantVectorStore:
+        """Vector store backed by an AsyncQdrantClient (runs on the upload loop)"""
+        if self._async_store is None:
+            aclient = AsyncQdrantClient(
+                url=self.qdrant_url,
+                api_key=self.qdrant_api_key,
+                prefer_grpc=self.prefer_grpc,
+                grpc_port=GRPC_PORT
+            )
+            self._async_store = QdrantVectorStore(
+                client=self.qdrant_client,
+                aclient=aclient,
+                collection_name=self.collection_name,
+            )
+        return self._async_store
+
+    async def _async_add(self, nodes: List[TextNode], batch_size: int, concurrency: int):
+        """Upsert embedded nodes in concurrent batches"""
+        store = await self._get_async_store()
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def upload(batch: List[TextNode]):
+            async with semaphore:
+                await store.async_add(batch)
+
+        await asyncio.gather(*(
+            upload(nodes[start:start + batch_size])
+            for start in range(0, len(nodes), batch_size)
+        ))
+
+    def _ensure_index(self):
+        """Wrap the vector store in an index once it has data"""
+        if self.index is None:
+            self.index = VectorStoreIndex.from_vector_store(
+                vector_store=self.vector_store,
+            )
+
+    def _build_nodes(self, transactions: List[Dict]) -> List[TextNode]:
+        """Convert transactions to LlamaIndex nodes"""
         nodes = []
         for tx in transactions:
             # Create searchable text
@@ -210,38 +516,119 @@ class FinanceVectorStore:
                     "type": tx.get("type", "debit"),
                     "file_id": tx.get("file_id", "unknown"),
                 },
-                excluded_embed_metadata_keys=["icon"],  # Don't embed the icon
+                # The text already holds the useful fields, so embed it alone
+                excluded_embed_metadata_keys=EMBED_EXCLUDED_KEYS,
                 excluded_llm_metadata_keys=["icon"],
             )
             nodes.append(node)
 
-        # Create or update index
-        self.index = VectorStoreIndex(
-            nodes=nodes,
-            storage_context=self.storage_context,
-        )
+        return nodes
 
-        return len(nodes)
+    def _prepare_nodes(self, transactions: List[Dict]) -> List[TextNode]:
+        """
+        Build embedded nodes ready for upload
+
+        The searchable text is rebuilt from metadata in search(), so it's
+        dropped after embedding rather than stored in every payload twice.
+        """
+        nodes = self._build_nodes(transactions)
+        self._embed_nodes(nodes)
+        for node in nodes:
+            node.set_content("")
+        return nodes
+
+    def _embed_nodes(self, nodes: List[TextNode]):
+        """
+        Attach embeddings to nodes using batched model calls
+
+        Cached embeddings are reused and identical texts are embedded only
+        once. The rest are embedded longest-first so each batch holds
+        similar lengths and pads to little more than its own longest text.
+        """
+        texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes]
+        keys = [EmbeddingCache.key(text) for text in texts]
+
+        cached = {}
+        if self.embedding_cache is not None:
+            cached = {
+                key: vec.tolist()
+                for key, vec in self.embedding_cache.get_many(keys).items()
+            }
+
+        # One representative per uncached text; duplicates reuse its vector
+        missing = {}
+        for i, key in enumerate(keys):
+            if key not in cached:
+                missing.setdefault(key, i)
+
+        if missing:
+            order = sorted(missing.values(), key=lambda i: len(texts[i]), reverse=True)
+            embeddings = self.embed_model.get_text_embedding_batch(
+                [texts[i] for i in order], show_progress=False
+            )
+            new = {keys[i]: embedding for i, embedding in zip(order, embeddings)}
+            if self.embedding_cache is not None:
+                self.embedding_cache.put_many(new)
+            cached.update(new)
+
+        for node, key in zip(nodes, keys):
+            node.embedding = cached[key]
+
+    def set_indexing_enabled(
+        self,
+        enabled: bool,
+        threshold: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Toggle HNSW indexing (disable during bulk uploads, re-enable after)
+
+        Disabling returns the collection's current indexing threshold, which
+        the caller passes back when re-enabling, so a threshold set by an
+        operator (or Qdrant's default) is preserved.
+
+        Args:
+            enabled: False to defer indexing, True to restore it
+            threshold: Threshold to restore (the value returned on disable)
+
+        Returns:
+            The previous threshold when disabling, otherwise None
+        """
+        try:
+            if enabled:
+                if threshold is None:
+                    # Indexing was never disabled, nothing to restore
+                    return None
+                self.qdrant_client.update_collection(
+                    collection_name=self.collection_name,
+                    optimizer_config=OptimizersConfigDiff(indexing_threshold=threshold)
+                )
+                return None
+
+            info = self.qdrant_client.get_collection(self.collection_name)
+            previous = info.config.optimizer_config.indexing_threshold
+            self.qdrant_client.update_collection(
+                collection_name=self.collection_name,
+                optimizer_config=OptimizersConfigDiff(indexing_threshold=0)
+            )
+            return previous
+        except Exception as e:
+            print(f"Error updating indexing threshold: {e}")
+            return None
 
     def _create_searchable_text(self, tx: Dict) -> str:
         """
-        Create rich searchable text from transaction
+        Create compact searchable text from transaction
 
-        This text will be embedded and searched against.
-        We include multiple representations for better search.
+        This text will be embedded and searched against, so it carries
+        only the fields that help retrieval (type is implied by the sign).
         """
         amount = tx.get("amount", 0)
         amount_type = "income" if amount > 0 else "expense"
 
-        text = f"""
-        Transaction on {tx.get('date', 'unknown date')}
-        Description: {tx.get('description', 'unknown')}
-        Amount: ${abs(amount):.2f} ({amount_type})
-        Category: {tx.get('category', 'other')}
-        Type: {tx.get('type', 'debit')}
-        """
-
-        return text.strip()
+        return (
+            f"{tx.get('date', 'unknown date')} {tx.get('description', 'unknown')} "
+            f"${abs(amount):.2f} {amount_type} {tx.get('category', 'other')}"
+        )
 
     def search(
         self,
@@ -266,31 +653,24 @@ class FinanceVectorStore:
             return []
 
         # Use retriever instead of query_engine (no LLM needed)
+        # Filters run inside Qdrant so top_k counts only matching points
         retriever = self.index.as_retriever(
             similarity_top_k=top_k,
+            filters=_search_filters(category_filter, file_id_filter),
         )
 
         # Retrieve similar nodes
         nodes = retriever.retrieve(query)
 
         # Extract results
-        results = []
-        for node in nodes:
-            metadata = node.metadata
-
-            # Apply filters if specified
-            if category_filter and metadata.get("category") != category_filter:
-                continue
-            if file_id_filter and metadata.get("file_id") != file_id_filter:
-                continue
-
-            results.append({
-                "text": node.text,
+        return [
+            {
+                "text": self._create_searchable_text(node.metadata),
                 "score": node.score,
-                **metadata
-            })
-
-        return results
+                **node.metadata
+            }
+            for node in nodes
+        ]
 
     def delete_by_file_id(self, file_id: str) -> int:
         """
@@ -302,45 +682,113 @@ class FinanceVectorStore:
         Returns:
             Number of points deleted
         """
+        file_filter = _file_filter(file_id)
+
         try:
+            # Qdrant's delete doesn't report a count, so count first
+            # (cheap thanks to the file_id index)
+            count = self.qdrant_client.count(
+                collection_name=self.collection_name,
+                count_filter=file_filter,
+                exact=True
+            ).count
+
             # Delete from Qdrant using filter
-            result = self.qdrant_client.delete(
+            self.qdrant_client.delete(
                 collection_name=self.collection_name,
-                points_selector=Filter(
-                    must=[
-                        FieldCondition(
-                            key="file_id",
-                            match=MatchValue(value=file_id)
-                        )
-                    ]
-                )
+                points_selector=file_filter,
+                wait=True
             )
-            print(f"✓ Deleted transactions for file_id: {file_id}")
-            return 1  # Qdrant doesn't return count, so return 1 for success
+            print(f"✓ Deleted {count} transactions for file_id: {file_id}")
+            return count
         except Exception as e:
             print(f"✗ Error deleting file_id {file_id}: {e}")
             return 0
 
+    def delete_by_file_ids(self, file_ids: List[str]) -> int:
+        """
+        Delete all transactions from several files in one request
+
+        Args:
+            file_ids: The file_ids to delete
+
+        Returns:
+            Number of points deleted
+        """
+        if not file_ids:
+            return 0
+
+        files_filter = Filter(
+            must=[
+                FieldCondition(
+                    key="file_id",
+                    match=MatchAny(any=list(file_ids))
+                )
+            ]
+        )
+
+        try:
+            # Qdrant's delete doesn't report a count, so count first
+            count = self.qdrant_client.count(
+                collection_name=self.collection_name,
+                count_filter=files_filter,
+                exact=True
+            ).count
+
+            self.qdrant_client.delete(
+                collection_name=self.collection_name,
+                points_selector=files_filter,
+                wait=True
+            )
+            print(f"✓ Deleted {count} transactions for file_ids: {', '.join(file_ids)}")
+            return count
+        except Exception as e:
+            print(f"✗ Error deleting file_ids {file_ids}: {e}")
+            return 0
+
     def get_all_file_ids(self) -> List[str]:
         """Get list of all unique file_ids in the store"""
         try:
-            # Scroll through all points to get file_ids
-            records, _ = self.qdrant_client.scroll(
+            # Let Qdrant count unique values over the file_id index
+            response = self.qdrant_client.facet(
                 collection_name=self.collection_name,
-                limit=10000,
-                with_payload=True
+                key="file_id",
+                limit=FACET_LIMIT
             )
+            return [hit.value for hit in response.hits]
+        except Exception:
+            # Older Qdrant versions have no facet API
+            pass
 
-            file_ids = set()
-            for record in records:
-                if record.payload:
-                    file_ids.add(record.payload.get("file_id", "unknown"))
-
-            return list(file_ids)
+        try:
+            return self._scroll_file_ids()
         except Exception as e:
             print(f"Error getting file_ids: {e}")
             return []
 
+    def _scroll_file_ids(self) -> List[str]:
+        """Collect unique file_ids by paging through all points"""
+        file_ids = set()
+        offset = None
+
+        while True:
+            records, offset = self.qdrant_client.scroll(
+                collection_name=self.collection_name,
+                limit=1024,
+                offset=offset,
+                with_payload=["file_id"],
+                with_vectors=False
+            )
+            file_ids.update({
+                record.payload["file_id"]
+                for record in records
+                if record.payload and "file_id" in record.payload
+            })
+            if offset is None:
+                break
+
+        return list(file_ids)
+
     def get_collection_stats(self) -> Dict:
         """Get statistics about the collection"""
         try:
@@ -0,0 +1,79 @@
+"""
+Check the regex categorizer against the original keyword loop
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add src to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from categorizer import TransactionCategorizer
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+CATEGORIES_PATH = DATA_DIR / "categories.json"
+
+# Descriptions with keywords from two or more categories
+MIXED_DESCRIPTIONS = [
+    "PAYPAL *NETFLIX",
+    "VENMO RENT PAYMENT",
+    "TARGET #1234",
+    "AMAZON PRIME MEMBERSHIP",
+    "WALMART GROCERY PICKUP",
+    "ZELLE RECEIVED FROM JOHN",
+    "VENMO PAYMENT RECEIVED",
+    "UBER EATS STARBUCKS",
+    "UNKNOWN MERCHANT 42",
+    "",
+]
+
+
+def keyword_loop_category(description: str) -> str:
+    """The original categorizer: first keyword in definition order wins"""
+    with open(CATEGORIES_PATH) as f:
+        categories = json.load(f)["categories"]
+
+    keyword_map = {}
+    for category, info in categories.items():
+        for keyword in info.get("keywords", []):
+            keyword_map[keyword.lower()] = category
+
+    description_lower = description.lower()
+    for keyword, category in keyword_map.items():
+        if keyword in description_lower:
+            return category
+    return "other"
+
+
+def demo_descriptions():
+    with open(DATA_DIR / "sample_transactions.csv") as f:
+        return [row["description"] for row in csv.DictReader(f)]
+
+
+@pytest.fixture(scope="module")
+def categorizer():
+    return TransactionCategorizer(str(CATEGORIES_PATH))
+
+
+@pytest.mark.parametrize("description", MIXED_DESCRIPTIONS + demo_descriptions())
+def test_categorize_matches_keyword_loop(categorizer, description):
+    assert categorizer.categorize(description)["category"] == keyword_loop_category(description)
+
+
+def test_categorize_series_matches_categorize(categorizer):
+    descriptions = MIXED_DESCRIPTIONS + demo_descriptions()
+    series = pd.Series(descriptions, dtype="string")
+
+    expected = [categorizer.categorize(d)["category"] for d in descriptions]
+    assert categorizer.categorize_series(series).tolist() == expected
+
+
+def test_categorize_series_handles_missing_descriptions(categorizer):
+    series = pd.Series(["STARBUCKS #1234", pd.NA, "<NA>"], dtype="string[pyarrow]")
+
+    assert categorizer.categorize_series(series).tolist() == ["dining", "other", "other"]